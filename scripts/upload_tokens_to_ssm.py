@@ -10,6 +10,7 @@ Requires AWS CLI configured with appropriate IAM permissions.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from getpass import getpass
 
 try:
@@ -85,6 +86,8 @@ def main() -> None:
     print()
     PARAMETERS = GMAIL_PARAMETERS + anthropic_params + SLACK_PARAMETERS
 
+    # Phase 1: collect values (necessarily serial — interactive TTY prompts)
+    to_upload: list[tuple[str, str, bool]] = []
     for param in PARAMETERS:
         if param["secret"]:
             value = getpass(f"  {param['prompt']}: ")
@@ -95,17 +98,36 @@ def main() -> None:
             print(f"  Skipping {param['name']} (empty value)")
             continue
 
-        try:
-            ssm.put_parameter(
-                Name=param["name"],
-                Value=value.strip(),
-                Type="SecureString" if param["secret"] else "String",
-                Overwrite=True,
-            )
-            print(f"  -> Stored {param['name']}")
-        except Exception as e:
-            print(f"  -> FAILED to store {param['name']}: {e}")
-            sys.exit(1)
+        to_upload.append((param["name"], value.strip(), param["secret"]))
+
+    # Phase 2: upload concurrently — each put_parameter is an independent
+    # ~100-300ms AWS round trip, and boto3 clients are thread-safe
+    def _put(name: str, value: str, secret: bool) -> str:
+        ssm.put_parameter(
+            Name=name,
+            Value=value,
+            Type="SecureString" if secret else "String",
+            Overwrite=True,
+        )
+        return name
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, len(to_upload))) as executor:
+        futures = {
+            executor.submit(_put, name, value, secret): name
+            for name, value, secret in to_upload
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                print(f"  -> Stored {name}")
+            except Exception as e:
+                print(f"  -> FAILED to store {name}: {e}")
+                failed = True
+
+    if failed:
+        sys.exit(1)
 
     print()
     print("All credentials stored successfully!")
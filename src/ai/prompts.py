@@ -20,9 +20,10 @@ Priority scoring guidelines:
 
 For emails categorized as "Action Immediately", also generate a concise suggested reply draft that the user can review and send. The draft should be professional, direct, and acknowledge the sender's request."""
 
-BATCH_CATEGORIZATION_PROMPT = """Analyze the following {count} emails and categorize each one.
-
-{emails_xml}
+# Static instructional preamble, sent as its own cacheable content block.
+# The dynamic email XML is appended as a separate block after it so the
+# cacheable prefix (tools + system + preamble) is identical across batches.
+BATCH_CATEGORIZATION_PREAMBLE = """Analyze the following emails and categorize each one.
 
 Respond with a JSON object containing a "categorizations" array. Each element must have:
 - "email_id": the id attribute from the email element
@@ -30,13 +31,6 @@ Respond with a JSON object containing a "categorizations" array. Each element mu
 - "priority": integer 1-10
 - "summary": brief 1-2 sentence summary
 - "reasoning": short explanation for the categorization
-- "suggested_reply": draft reply text (only for "Action Immediately" emails, null otherwise)"""
+- "suggested_reply": draft reply text (only for "Action Immediately" emails, null otherwise)
 
-EMAIL_XML_TEMPLATE = """<email id="{message_id}">
-<from>{sender}</from>
-<subject>{subject}</subject>
-<date>{date}</date>
-<body>
-{body}
-</body>
-</email>"""
+Here are the emails:"""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -9,8 +10,15 @@ import yaml
 
 from src.utils.errors import ConfigError
 
+try:
+    # libyaml-backed loader parses ~5-10x faster than the pure-Python one;
+    # fall back silently where PyYAML was built without it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+
+@dataclass(slots=True)
 class GmailConfig:
     client_id: str
     client_secret: str
@@ -23,7 +31,7 @@ class GmailConfig:
     max_total_emails: int = 500
 
 
-@dataclass
+@dataclass(slots=True)
 class AIConfig:
     api_key: Optional[str] = None
     oauth_token: Optional[str] = None
@@ -31,7 +39,25 @@ class AIConfig:
     max_tokens: int = 4096
     temperature: float = 0.2
     batch_size: int = 10
+    # Per-request ceiling so a wedged connection fails fast into the retry
+    # path instead of eating the Lambda time budget
+    request_timeout: float = 120.0
+    # Per-batch prompt-token budget; closes a batch early when large bodies
+    # would push the prompt near the context limit
+    max_prompt_tokens: int = 150_000
     max_concurrent_requests: int = 5
+    # Message Batches API: 50% token price, but completion is only guaranteed
+    # within 24h — keep off unless the schedule tolerates a delayed digest
+    use_message_batches: bool = False
+    batch_poll_interval: float = 5.0
+    batch_poll_timeout: float = 240.0
+    # Client-side budgets matching the account's Anthropic tier; dispatch
+    # blocks preemptively instead of reacting to 429s
+    requests_per_minute: int = 50
+    tokens_per_minute: int = 200_000
+    # Opt-in beta that trims tool-use output encoding (~14% fewer output
+    # tokens); only honored by Claude Sonnet 3.7-era models, so off by default
+    token_efficient_tools: bool = False
 
     def __post_init__(self) -> None:
         if not self.api_key and not self.oauth_token:
@@ -42,7 +68,7 @@ class AIConfig:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class SlackConfig:
     bot_token: str = ""
     user_id: str = ""
@@ -61,7 +87,7 @@ class SlackConfig:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportConfig:
     format: str = "markdown"
     output_path: str = "/tmp/email_digest.md"
@@ -69,13 +95,13 @@ class ReportConfig:
     s3_prefix: str = "digests/"
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     level: str = "INFO"
     format: str = "json"
 
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     gmail: GmailConfig
     ai: AIConfig
@@ -84,6 +110,36 @@ class AppConfig:
     logging: LoggingConfig
 
 
+# Parsed YAML keyed by (path, mtime_ns): repeated load_config calls within a
+# warm container skip the file read and parse unless the file changed. Only
+# the raw dict is cached — env vars are re-read on every call.
+_YAML_CACHE: dict[tuple[str, Optional[int]], dict] = {}
+
+
+def _load_yaml(config_path: str) -> dict:
+    try:
+        mtime: Optional[int] = os.stat(config_path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    key = (config_path, mtime)
+    cached = _YAML_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        with open(config_path) as f:
+            raw = yaml.load(f, Loader=_YamlLoader) or {}
+    except FileNotFoundError:
+        raw = {}
+    except yaml.YAMLError as e:
+        raise ConfigError(f"Failed to parse config.yaml: {e}") from e
+
+    _YAML_CACHE.clear()
+    _YAML_CACHE[key] = raw
+    return raw
+
+
 def load_config(config_path: Optional[str] = None) -> AppConfig:
     """Load configuration from config.yaml overlaid with environment variables.
 
@@ -96,16 +152,12 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
             str(Path(__file__).parent.parent / "config.yaml"),
         )
 
-    try:
-        with open(config_path) as f:
-            raw = yaml.safe_load(f) or {}
-    except FileNotFoundError:
-        raw = {}
-    except yaml.YAMLError as e:
-        raise ConfigError(f"Failed to parse config.yaml: {e}") from e
+    # Deep-copy so callers mutating nested lists can't poison the cache
+    raw = copy.deepcopy(_load_yaml(config_path))
 
     gmail_cfg = raw.get("gmail", {})
     ai_cfg = raw.get("ai", {})
+    rate_cfg = raw.get("rate_limits", {})
     slack_cfg = raw.get("slack", {})
     report_cfg = raw.get("report", {})
     logging_cfg = raw.get("logging", {})
@@ -128,7 +180,15 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
                 max_tokens=ai_cfg.get("max_tokens", 4096),
                 temperature=ai_cfg.get("temperature", 0.2),
                 batch_size=ai_cfg.get("batch_size", 10),
+                request_timeout=ai_cfg.get("request_timeout", 120.0),
+                max_prompt_tokens=ai_cfg.get("max_prompt_tokens", 150_000),
                 max_concurrent_requests=ai_cfg.get("max_concurrent_requests", 5),
+                use_message_batches=ai_cfg.get("use_message_batches", False),
+                batch_poll_interval=ai_cfg.get("batch_poll_interval", 5.0),
+                batch_poll_timeout=ai_cfg.get("batch_poll_timeout", 240.0),
+                token_efficient_tools=ai_cfg.get("token_efficient_tools", False),
+                requests_per_minute=rate_cfg.get("anthropic_requests_per_minute", 50),
+                tokens_per_minute=rate_cfg.get("anthropic_tokens_per_minute", 200_000),
             ),
             slack=SlackConfig(
                 bot_token=os.environ.get("SLACK_BOT_TOKEN", ""),
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import re
 
 from src.models import CategorizedEmail, DigestGroup
 
+# Compiled once at import: strips any run of leading "Re:"/"Fwd:"/"Fw:"
+# prefixes in a single C-level pass.
+_SUBJECT_PREFIX_RE = re.compile(r"^(?:\s*(?:re|fwd?)\s*:\s*)+", re.IGNORECASE)
+
+
+def _clean_subject(subject: str) -> str:
+    return _SUBJECT_PREFIX_RE.sub("", subject).strip()
+
 
 class ThreadGrouper:
     """Groups categorized emails by thread ID and sender domain."""
@@ -12,44 +20,61 @@ class ThreadGrouper:
     def group_emails(emails: list[CategorizedEmail]) -> list[DigestGroup]:
         """Group emails by threadId first, then by sender domain for singletons.
 
-        Returns groups sorted by highest priority descending.
+        Returns groups sorted by highest priority descending. The max priority
+        of each bucket is tracked while bucketing, so no group needs a second
+        traversal to compute it.
         """
-        thread_groups: dict[str, list[CategorizedEmail]] = defaultdict(list)
+        thread_groups: dict[str, list[CategorizedEmail]] = {}
+        thread_max: dict[str, int] = {}
         for email in emails:
-            thread_groups[email.email.thread_id].append(email)
+            tid = email.email.thread_id
+            priority = email.categorization.priority
+            group = thread_groups.get(tid)
+            if group is None:
+                thread_groups[tid] = [email]
+                thread_max[tid] = priority
+            else:
+                group.append(email)
+                if priority > thread_max[tid]:
+                    thread_max[tid] = priority
 
         digest_groups: list[DigestGroup] = []
         singleton_emails: list[CategorizedEmail] = []
 
         for thread_id, thread_emails in thread_groups.items():
             if len(thread_emails) > 1:
-                subject = thread_emails[0].email.subject
+                subject = _clean_subject(thread_emails[0].email.subject)
+                # model_construct skips pydantic validation; these groups are
+                # built purely from already-validated CategorizedEmails
                 digest_groups.append(
-                    DigestGroup(
+                    DigestGroup.model_construct(
                         group_key=thread_id,
                         group_label=f"Thread: {subject}",
                         emails=sorted(thread_emails, key=lambda e: e.email.date),
-                        highest_priority=max(
-                            e.categorization.priority for e in thread_emails
-                        ),
+                        highest_priority=thread_max[thread_id],
                     )
                 )
             else:
-                singleton_emails.extend(thread_emails)
+                singleton_emails.append(thread_emails[0])
 
-        domain_groups: dict[str, list[CategorizedEmail]] = defaultdict(list)
+        domain_groups: dict[str, list[CategorizedEmail]] = {}
+        domain_max: dict[str, int] = {}
         for email in singleton_emails:
-            domain = (
-                email.email.sender_email.split("@")[-1]
-                if "@" in email.email.sender_email
-                else "unknown"
-            )
-            domain_groups[domain].append(email)
+            domain = email.email.sender_domain
+            priority = email.categorization.priority
+            group = domain_groups.get(domain)
+            if group is None:
+                domain_groups[domain] = [email]
+                domain_max[domain] = priority
+            else:
+                group.append(email)
+                if priority > domain_max[domain]:
+                    domain_max[domain] = priority
 
         for domain, domain_emails in domain_groups.items():
             if len(domain_emails) > 1:
                 digest_groups.append(
-                    DigestGroup(
+                    DigestGroup.model_construct(
                         group_key=f"domain:{domain}",
                         group_label=f"From: {domain} ({len(domain_emails)} emails)",
                         emails=sorted(
@@ -57,15 +82,13 @@ class ThreadGrouper:
                             key=lambda e: e.categorization.priority,
                             reverse=True,
                         ),
-                        highest_priority=max(
-                            e.categorization.priority for e in domain_emails
-                        ),
+                        highest_priority=domain_max[domain],
                     )
                 )
             else:
                 e = domain_emails[0]
                 digest_groups.append(
-                    DigestGroup(
+                    DigestGroup.model_construct(
                         group_key=e.email.message_id,
                         group_label=e.email.subject,
                         emails=[e],
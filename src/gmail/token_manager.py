@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
-import boto3
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 
@@ -17,6 +17,12 @@ logger = logging.getLogger(__name__)
 GOOGLE_TOKEN_URI = "https://oauth2.googleapis.com/token"
 SSM_REFRESH_TOKEN_PATH = "/email-manager/gmail/refresh-token"
 
+# Access tokens live ~1h; cache the refreshed credentials at module scope so
+# warm Lambda invocations skip the token-endpoint round trip (~150-400ms)
+# until shortly before expiry. google-auth expiry timestamps are naive UTC.
+_cached_creds: Optional[Credentials] = None
+_EXPIRY_MARGIN_SECONDS = 60
+
 
 class TokenManager:
     """Manages Gmail OAuth2 tokens with SSM Parameter Store as backing store."""
@@ -26,13 +32,24 @@ class TokenManager:
         self._client_secret = config.client_secret
         self._refresh_token = config.refresh_token
         self._scopes = config.scopes
-        self._ssm_client = boto3.client("ssm")
 
     def get_credentials(self) -> Credentials:
         """Build Credentials from the refresh token and refresh the access token.
 
         If Google rotates the refresh token, the new one is persisted to SSM.
         """
+        global _cached_creds
+
+        cached = _cached_creds
+        if (
+            cached is not None
+            and cached.refresh_token == self._refresh_token
+            and cached.valid
+            and cached.expiry is not None
+            and (cached.expiry - datetime.utcnow()).total_seconds() > _EXPIRY_MARGIN_SECONDS
+        ):
+            return cached
+
         try:
             creds = Credentials(
                 token=None,
@@ -51,11 +68,17 @@ class TokenManager:
             self._update_ssm_refresh_token(creds.refresh_token)
             self._refresh_token = creds.refresh_token
 
+        _cached_creds = creds
         return creds
 
     def _update_ssm_refresh_token(self, new_token: str) -> None:
+        # boto3 costs ~100-400ms of cold-start import and is only needed on
+        # the rare rotation path, so it is imported here rather than at module
+        # scope
+        import boto3
+
         try:
-            self._ssm_client.put_parameter(
+            boto3.client("ssm").put_parameter(
                 Name=SSM_REFRESH_TOKEN_PATH,
                 Value=new_token,
                 Type="SecureString",
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
 import sys
 from datetime import datetime, timezone
 from typing import Optional
 
+import orjson
+
+_UTC = timezone.utc
+
 
 class JsonFormatter(logging.Formatter):
     """Structured JSON log formatter for CloudWatch."""
@@ -14,6 +17,7 @@ class JsonFormatter(logging.Formatter):
     def __init__(self, request_id: Optional[str] = None):
         super().__init__()
         self._request_id = request_id
+        self._state: Optional[str] = None
 
     def set_request_id(self, request_id: str) -> None:
         self._request_id = request_id
@@ -22,8 +26,12 @@ class JsonFormatter(logging.Formatter):
         self._state = state
 
     def format(self, record: logging.LogRecord) -> str:
+        # record.created is the timestamp logging already took for this
+        # record, so no second clock read is needed here
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, _UTC).isoformat(
+                timespec="milliseconds"
+            ),
             "level": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
@@ -32,21 +40,27 @@ class JsonFormatter(logging.Formatter):
         if self._request_id:
             log_entry["request_id"] = self._request_id
 
-        if hasattr(self, "_state"):
+        if self._state is not None:
             log_entry["state"] = self._state
 
-        if hasattr(record, "state"):
-            log_entry["state"] = record.state
+        # Dict lookups beat the hasattr/getattr pair for the optional extras
+        record_dict = record.__dict__
+        state = record_dict.get("state")
+        if state is not None:
+            log_entry["state"] = state
 
-        if hasattr(record, "duration_ms"):
-            log_entry["duration_ms"] = record.duration_ms
+        duration_ms = record_dict.get("duration_ms")
+        if duration_ms is not None:
+            log_entry["duration_ms"] = duration_ms
 
         if record.exc_info and record.exc_info[1]:
             log_entry["error_type"] = type(record.exc_info[1]).__name__
             log_entry["error_message"] = str(record.exc_info[1])
             log_entry["traceback"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_entry, default=str)
+        # orjson serializes several times faster than stdlib json and this
+        # runs once per log record
+        return orjson.dumps(log_entry, default=str).decode()
 
 
 class TextFormatter(logging.Formatter):
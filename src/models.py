@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Optional
 
 from pydantic import BaseModel, Field
@@ -36,6 +37,12 @@ class RawEmail(BaseModel):
     label_ids: list[str] = Field(default_factory=list)
     gmail_link: str
 
+    @cached_property
+    def sender_domain(self) -> str:
+        """Domain part of sender_email, computed once per instance."""
+        sender_email = self.sender_email
+        return sender_email.rsplit("@", 1)[-1] if "@" in sender_email else "unknown"
+
 
 class Categorization(BaseModel):
     category: EmailCategory
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Optional
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+
+import orjson
+import urllib3
 
 from src.utils.errors import SlackDeliveryError
 
@@ -15,6 +17,11 @@ logger = logging.getLogger(__name__)
 
 SLACK_API_BASE = "https://slack.com/api"
 
+# DM channel IDs are stable for a (bot, user) pair, so cache them at module
+# scope: warm Lambda invocations then skip the conversations.open round trip.
+# The token is hashed so the raw secret never sits in a long-lived dict key.
+_DM_CHANNEL_CACHE: dict[tuple[str, str], str] = {}
+
 
 class SlackNotifier:
     """Sends DMs to a user via Slack Bot Token API.
@@ -27,6 +34,27 @@ class SlackNotifier:
         self._bot_token = config.bot_token
         self._user_id = config.user_id
         self._dm_channel_id: Optional[str] = None
+        # Pooled keep-alive connections to slack.com: every call after the
+        # first skips the TCP+TLS handshake. maxsize matches the worker count
+        # used when posting continuation chunks concurrently.
+        self._http = urllib3.PoolManager(
+            maxsize=4,
+            timeout=urllib3.Timeout(total=15),
+            # Retry transient Slack failures (429/5xx) on the pooled socket,
+            # honoring Retry-After; POST must be allowed explicitly since it
+            # is not in urllib3's idempotent default set
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["POST"]),
+                respect_retry_after_header=True,
+            ),
+            headers={
+                "Authorization": f"Bearer {config.bot_token}",
+                "Content-Type": "application/json; charset=utf-8",
+            },
+        )
 
     def send(self, payload: dict) -> bool:
         """Send a Block Kit message as a DM to the configured user."""
@@ -38,6 +66,15 @@ class SlackNotifier:
         if self._dm_channel_id:
             return self._dm_channel_id
 
+        cache_key = (
+            hashlib.blake2b(self._bot_token.encode(), digest_size=16).hexdigest(),
+            self._user_id,
+        )
+        cached = _DM_CHANNEL_CACHE.get(cache_key)
+        if cached is not None:
+            self._dm_channel_id = cached
+            return cached
+
         response = self._slack_api_call(
             "conversations.open",
             {"users": self._user_id},
@@ -50,6 +87,7 @@ class SlackNotifier:
             )
 
         self._dm_channel_id = response["channel"]["id"]
+        _DM_CHANNEL_CACHE[cache_key] = self._dm_channel_id
         logger.info(f"Opened DM channel: {self._dm_channel_id}")
         return self._dm_channel_id
 
@@ -62,21 +100,31 @@ class SlackNotifier:
 
         # Split into chunks of 48 blocks (leaving room for continuation header)
         chunks = [blocks[i : i + 48] for i in range(0, len(blocks), 48)]
-        for i, chunk in enumerate(chunks):
-            if i > 0:
-                chunk.insert(
-                    0,
-                    {
-                        "type": "context",
-                        "elements": [
-                            {
-                                "type": "mrkdwn",
-                                "text": f"_...continued ({i + 1}/{len(chunks)})_",
-                            }
-                        ],
-                    },
-                )
-            self._send_single_message(channel_id, chunk)
+        for i, chunk in enumerate(chunks[1:], start=2):
+            chunk.insert(
+                0,
+                {
+                    "type": "context",
+                    "elements": [
+                        {
+                            "type": "mrkdwn",
+                            "text": f"_...continued ({i}/{len(chunks)})_",
+                        }
+                    ],
+                },
+            )
+
+        # Lead message first so the digest header lands on top; continuation
+        # chunks are numbered, so they can be posted concurrently
+        self._send_single_message(channel_id, chunks[0])
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(4, len(chunks) - 1)) as executor:
+                futures = [
+                    executor.submit(self._send_single_message, channel_id, chunk)
+                    for chunk in chunks[1:]
+                ]
+                for future in futures:
+                    future.result()
 
         return True
 
@@ -101,24 +149,15 @@ class SlackNotifier:
     def _slack_api_call(self, method: str, body: dict) -> dict:
         """Make an authenticated call to the Slack Web API."""
         url = f"{SLACK_API_BASE}/{method}"
-        data = json.dumps(body).encode("utf-8")
-
-        req = Request(
-            url,
-            data=data,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Authorization": f"Bearer {self._bot_token}",
-            },
-        )
+        # orjson serializes straight to UTF-8 bytes — no str round trip
+        data = orjson.dumps(body)
 
         try:
-            response = urlopen(req, timeout=15)
-            result = json.loads(response.read().decode("utf-8"))
-            return result
-        except URLError as e:
+            response = self._http.request("POST", url, body=data)
+            return orjson.loads(response.data)
+        except urllib3.exceptions.HTTPError as e:
             raise SlackDeliveryError(f"Slack API call to {method} failed: {e}") from e
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise SlackDeliveryError(
                 f"Invalid JSON response from Slack {method}: {e}"
             ) from e
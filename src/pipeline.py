@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from operator import attrgetter
 from typing import Optional
 
 from src.ai.categorizer import EmailCategorizer
@@ -26,6 +28,14 @@ from src.report.slack_formatter import SlackFormatter
 
 logger = logging.getLogger(__name__)
 
+# C-level dotted attribute getter: the sort comparator below runs once per
+# email per comparison, so avoid a Python-level lambda frame each time
+_PRIORITY_KEY = attrgetter("categorization.priority")
+
+# Stateless helpers shared across runs (and warm Lambda invocations)
+_THREAD_GROUPER = ThreadGrouper()
+_REPORT_GENERATOR = ReportGenerator()
+
 
 @dataclass
 class PipelineContext:
@@ -71,6 +81,8 @@ class PipelineRunner:
         self._config = config
         self._context = PipelineContext(config=config, request_id=request_id)
         self._current_state = PipelineState.INIT
+        self._categorizer_warmup: Optional[Future] = None
+        self._report_future: Optional[Future] = None
 
         self._state_handlers = {
             PipelineState.INIT: self._execute_init,
@@ -130,6 +142,12 @@ class PipelineRunner:
         logger.info("Pipeline initialized", extra={"state": "INIT"})
 
     def _execute_gather(self) -> None:
+        # Warm up the Anthropic client while the Gmail fetch is in flight so
+        # its construction hides behind Google's latency
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._categorizer_warmup = executor.submit(EmailCategorizer, self._config.ai)
+        executor.shutdown(wait=False)
+
         gmail_client = GmailClient(self._config.gmail)
         self._context.raw_emails = gmail_client.fetch_unlabeled_emails()
         logger.info(f"Gathered {len(self._context.raw_emails)} emails")
@@ -142,7 +160,14 @@ class PipelineRunner:
             logger.info("No emails to categorize, skipping")
             return
 
-        categorizer = EmailCategorizer(self._config.ai)
+        categorizer = None
+        if self._categorizer_warmup is not None:
+            try:
+                categorizer = self._categorizer_warmup.result()
+            except Exception as e:
+                logger.warning(f"Categorizer warm-up failed, constructing inline: {e}")
+        if categorizer is None:
+            categorizer = EmailCategorizer(self._config.ai)
         self._context.categorized_emails = categorizer.categorize_all(
             self._context.raw_emails
         )
@@ -153,57 +178,47 @@ class PipelineRunner:
             logger.info("No categorized emails to group, skipping")
             return
 
-        grouper = ThreadGrouper()
-        self._context.groups = grouper.group_emails(self._context.categorized_emails)
+        self._context.groups = _THREAD_GROUPER.group_emails(
+            self._context.categorized_emails
+        )
         logger.info(f"Created {len(self._context.groups)} email groups")
 
     def _execute_generate_report(self) -> None:
         now = datetime.now(timezone.utc)
         categorized = self._context.categorized_emails
 
-        self._context.digest = Digest(
+        # Bucket in a single pass instead of one filtering traversal per
+        # category, then sort each (smaller) bucket once
+        buckets: dict[EmailCategory, list[CategorizedEmail]] = {
+            category: [] for category in EmailCategory
+        }
+        for e in categorized:
+            buckets[e.categorization.category].append(e)
+        for bucket in buckets.values():
+            bucket.sort(key=_PRIORITY_KEY, reverse=True)
+
+        # Everything here was validated when it entered the pipeline, so skip
+        # pydantic re-validation on the internal aggregate
+        self._context.digest = Digest.model_construct(
             generated_at=now,
             total_emails=len(categorized),
             groups=self._context.groups,
-            action_immediately=sorted(
-                [
-                    e
-                    for e in categorized
-                    if e.categorization.category == EmailCategory.ACTION_IMMEDIATELY
-                ],
-                key=lambda e: e.categorization.priority,
-                reverse=True,
-            ),
-            action_eventually=sorted(
-                [
-                    e
-                    for e in categorized
-                    if e.categorization.category == EmailCategory.ACTION_EVENTUALLY
-                ],
-                key=lambda e: e.categorization.priority,
-                reverse=True,
-            ),
-            summary_only=sorted(
-                [
-                    e
-                    for e in categorized
-                    if e.categorization.category == EmailCategory.SUMMARY_ONLY
-                ],
-                key=lambda e: e.categorization.priority,
-                reverse=True,
-            ),
+            action_immediately=buckets[EmailCategory.ACTION_IMMEDIATELY],
+            action_eventually=buckets[EmailCategory.ACTION_EVENTUALLY],
+            summary_only=buckets[EmailCategory.SUMMARY_ONLY],
         )
 
         if categorized:
-            try:
-                report_gen = ReportGenerator()
-                self._context.report_path = report_gen.generate(
-                    self._context.digest, self._config.report.output_path
-                )
-                logger.info(f"Report generated at {self._context.report_path}")
-            except Exception as e:
-                logger.error(f"Report file generation failed: {e}", exc_info=True)
-                self._context.errors.append(f"Report generation failed: {e}")
+            # The markdown write is pure disk I/O and nothing before the final
+            # response reads it, so run it on a background thread and let the
+            # Slack send overlap with it; _build_response collects the result
+            executor = ThreadPoolExecutor(max_workers=1)
+            self._report_future = executor.submit(
+                _REPORT_GENERATOR.generate,
+                self._context.digest,
+                self._config.report.output_path,
+            )
+            executor.shutdown(wait=False)
 
     def _execute_report(self) -> None:
         """Terminal state: send Slack notification (success digest or failure alert)."""
@@ -267,28 +282,37 @@ class PipelineRunner:
             )
 
     def _build_response(self) -> LambdaResponse:
+        if self._report_future is not None:
+            try:
+                self._context.report_path = self._report_future.result(timeout=30)
+                logger.info(f"Report generated at {self._context.report_path}")
+            except Exception as e:
+                logger.error(f"Report file generation failed: {e}", exc_info=True)
+                self._context.errors.append(f"Report generation failed: {e}")
+
         categorized = self._context.categorized_emails
+        digest = self._context.digest
         category_counts = {}
-        if categorized:
+        if categorized and digest is not None:
+            # The digest already bucketed every email by category; reuse the
+            # bucket sizes instead of re-walking the categorized list
+            category_counts = {
+                "Action Immediately": len(digest.action_immediately),
+                "Action Eventually": len(digest.action_eventually),
+                "Summary Only": len(digest.summary_only),
+            }
+        elif categorized:
+            # Failure before GENERATE_REPORT: count in one pass
+            counts = {category: 0 for category in EmailCategory}
+            for e in categorized:
+                counts[e.categorization.category] += 1
             category_counts = {
-                "Action Immediately": sum(
-                    1
-                    for e in categorized
-                    if e.categorization.category == EmailCategory.ACTION_IMMEDIATELY
-                ),
-                "Action Eventually": sum(
-                    1
-                    for e in categorized
-                    if e.categorization.category == EmailCategory.ACTION_EVENTUALLY
-                ),
-                "Summary Only": sum(
-                    1
-                    for e in categorized
-                    if e.categorization.category == EmailCategory.SUMMARY_ONLY
-                ),
+                "Action Immediately": counts[EmailCategory.ACTION_IMMEDIATELY],
+                "Action Eventually": counts[EmailCategory.ACTION_EVENTUALLY],
+                "Summary Only": counts[EmailCategory.SUMMARY_ONLY],
             }
 
-        return LambdaResponse(
+        return LambdaResponse.model_construct(
             status="success" if self._context.success else "error",
             emails_processed=len(categorized),
             emails_by_category=category_counts,
@@ -7,9 +7,28 @@ from typing import Optional
 from src.models import CategorizedEmail, Digest, PipelineState
 
 
+# Shared immutable block: every digest and failure payload ends sections with
+# the same divider, and the serializer never mutates blocks
+_DIVIDER = {"type": "divider"}
+
+
+def _truncate(text: str, max_len: int) -> str:
+    # Module-level and expression-bodied: called several times per email, so
+    # skip the bound-method lookup the old staticmethod paid at each call
+    return text if len(text) <= max_len else text[: max_len - 3] + "..."
+
+
 class SlackFormatter:
     """Builds Slack Block Kit JSON payloads for success digests and failure alerts."""
 
+    # Indicator per priority 0-10: direct index beats re-evaluating the
+    # threshold branches for every email in the digest loop
+    _PRIORITY_ICON = (
+        (":white_circle:",) * 5
+        + (":large_orange_circle:",) * 3
+        + (":red_circle:",) * 3
+    )
+
     def __init__(
         self,
         max_per_category: int = 15,
@@ -42,42 +61,27 @@ class SlackFormatter:
                 ],
             }
         )
-        blocks.append({"type": "divider"})
-
-        if digest.action_immediately:
-            blocks.append(
-                self._section_header("Action Immediately", len(digest.action_immediately))
-            )
-            for email in digest.action_immediately[: self._max_per_category]:
-                blocks.extend(
-                    self._format_email_block(email, show_reply=self._include_reply_drafts)
-                )
-            blocks.append({"type": "divider"})
-
-        if digest.action_eventually:
-            blocks.append(
-                self._section_header("Action Eventually", len(digest.action_eventually))
-            )
-            for email in digest.action_eventually[: self._max_per_category]:
-                blocks.extend(self._format_email_block(email, show_reply=False))
-            blocks.append({"type": "divider"})
-
-        if digest.summary_only:
-            blocks.append(
-                self._section_header("Summary Only", len(digest.summary_only))
-            )
-            summary_text = "\n".join(
-                f"- <{e.email.gmail_link}|{self._truncate(e.email.subject, 60)}> "
-                f"(P{e.categorization.priority}) - "
-                f"{self._truncate(e.categorization.summary, 80)}"
-                for e in digest.summary_only[: self._max_per_category]
-            )
-            blocks.append(
-                {
-                    "type": "section",
-                    "text": {"type": "mrkdwn", "text": summary_text[:3000]},
-                }
-            )
+        blocks.append(_DIVIDER)
+
+        # One table-driven loop instead of three near-identical branches;
+        # summary mode collapses its section into a single text block and
+        # (as before) gets no trailing divider
+        sections = (
+            ("Action Immediately", digest.action_immediately, self._include_reply_drafts, False),
+            ("Action Eventually", digest.action_eventually, False, False),
+            ("Summary Only", digest.summary_only, False, True),
+        )
+        for title, emails, show_reply, summary_mode in sections:
+            if not emails:
+                continue
+            blocks.append(self._section_header(title, len(emails)))
+            shown = emails[: self._max_per_category]
+            if summary_mode:
+                blocks.append(self._summary_block(shown))
+            else:
+                for email in shown:
+                    blocks.extend(self._format_email_block(email, show_reply=show_reply))
+                blocks.append(_DIVIDER)
 
         return {"blocks": blocks}
 
@@ -89,7 +93,11 @@ class SlackFormatter:
     ) -> dict:
         """Build the Slack Block Kit payload for a pipeline failure alert."""
         now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-        tb = traceback.format_exception(type(error), error, error.__traceback__)
+        # Only the last 500 chars survive, so don't format the whole stack:
+        # a negative limit keeps just the innermost frames
+        tb = traceback.format_exception(
+            type(error), error, error.__traceback__, limit=-8
+        )
         tb_str = "".join(tb)[-500:]
 
         blocks: list[dict] = [
@@ -101,7 +109,7 @@ class SlackFormatter:
                     "emoji": True,
                 },
             },
-            {"type": "divider"},
+            _DIVIDER,
             {
                 "type": "section",
                 "fields": [
@@ -135,6 +143,18 @@ class SlackFormatter:
 
         return {"blocks": blocks}
 
+    def _summary_block(self, emails: list[CategorizedEmail]) -> dict:
+        summary_text = "\n".join(
+            f"- <{e.email.gmail_link}|{_truncate(e.email.subject, 60)}> "
+            f"(P{e.categorization.priority}) - "
+            f"{_truncate(e.categorization.summary, 80)}"
+            for e in emails
+        )
+        return {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": summary_text[:3000]},
+        }
+
     def _section_header(self, title: str, count: int) -> dict:
         return {
             "type": "section",
@@ -150,7 +170,7 @@ class SlackFormatter:
 
         text = (
             f"{priority_bar} *<{e.email.gmail_link}|"
-            f"{self._truncate(e.email.subject, 80)}>*\n"
+            f"{_truncate(e.email.subject, 80)}>*\n"
             f"From: {e.email.sender} | Priority: {e.categorization.priority}/10\n"
             f"{e.categorization.summary}"
         )
@@ -167,7 +187,7 @@ class SlackFormatter:
                             "type": "mrkdwn",
                             "text": (
                                 f"*Suggested reply:* "
-                                f"_{self._truncate(e.categorization.suggested_reply, 200)}_"
+                                f"_{_truncate(e.categorization.suggested_reply, 200)}_"
                             ),
                         }
                     ],
@@ -176,17 +196,8 @@ class SlackFormatter:
 
         return blocks
 
-    @staticmethod
-    def _priority_indicator(priority: int) -> str:
-        if priority >= 8:
-            return ":red_circle:"
-        elif priority >= 5:
-            return ":large_orange_circle:"
-        else:
-            return ":white_circle:"
-
-    @staticmethod
-    def _truncate(text: str, max_len: int) -> str:
-        if len(text) <= max_len:
-            return text
-        return text[: max_len - 3] + "..."
+    @classmethod
+    def _priority_indicator(cls, priority: int) -> str:
+        # Clamp covers out-of-range values the same way the old branches did
+        return cls._PRIORITY_ICON[min(max(priority, 0), 10)]
+
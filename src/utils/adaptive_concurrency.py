@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+
+class AdaptiveConcurrencyController:
+    """AIMD concurrency gate for upstream API calls.
+
+    Additively raises the in-flight limit while responses stay fast and
+    healthy, multiplicatively backs off when the upstream throttles — the
+    same control loop TCP uses for congestion. Callers wrap each request in
+    acquire()/release() and report the outcome.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        increase_step: float = 0.5,
+        backoff_factor: float = 0.5,
+        target_latency: float = 15.0,
+        window: int = 20,
+    ):
+        self._max = float(max_concurrency)
+        self._min = float(min_concurrency)
+        self._increase_step = increase_step
+        self._backoff_factor = backoff_factor
+        self._target_latency = target_latency
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """Block until an in-flight slot is available under the current limit."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def record_success(self, latency: float) -> None:
+        """Additive increase while the latency window stays under target."""
+        with self._cond:
+            self._latencies.append(latency)
+            mean = sum(self._latencies) / len(self._latencies)
+            if mean <= self._target_latency and self._limit < self._max:
+                self._limit = min(self._max, self._limit + self._increase_step)
+                self._cond.notify()
+
+    def record_throttle(self) -> None:
+        """Multiplicative decrease on 429/5xx from the upstream."""
+        with self._cond:
+            self._limit = max(self._min, self._limit * self._backoff_factor)
+
+    def __enter__(self) -> "AdaptiveConcurrencyController":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import logging
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, TypeVar
 
 logger = logging.getLogger(__name__)
@@ -16,39 +18,69 @@ def process_in_batches(
     processor: Callable[[list[T]], list[R]],
     max_retries: int = 2,
     retry_delay: float = 2.0,
+    concurrency: int = 4,
 ) -> list[R]:
     """Process a list of items in batches with retry logic.
 
+    Batches run concurrently on up to ``concurrency`` threads (the work is
+    I/O-bound API calls), while results are collected in submission order.
     Uses exponential backoff on failure. Designed for Lambda time constraints.
     """
-    results: list[R] = []
     total_batches = (len(items) + batch_size - 1) // batch_size
 
-    for i in range(0, len(items), batch_size):
-        batch = items[i : i + batch_size]
-        batch_num = i // batch_size + 1
-
+    def _run_batch(batch: list[T], batch_num: int) -> list[R]:
         for attempt in range(max_retries + 1):
             try:
                 logger.info(
-                    f"Processing batch {batch_num}/{total_batches} "
-                    f"(attempt {attempt + 1}, {len(batch)} items)"
+                    "Processing batch %d/%d (attempt %d, %d items)",
+                    batch_num,
+                    total_batches,
+                    attempt + 1,
+                    len(batch),
                 )
-                batch_results = processor(batch)
-                results.extend(batch_results)
-                break
+                return processor(batch)
             except Exception as e:
                 if attempt < max_retries:
-                    delay = retry_delay * (attempt + 1)
+                    # Full-jitter exponential backoff: concurrent workers that
+                    # hit the same 429 spread out instead of retrying in step
+                    delay = random.uniform(0.0, min(retry_delay * (2**attempt), 30.0))
+                    retry_after = getattr(e, "retry_after", None)
+                    if retry_after is not None:
+                        delay = max(delay, float(retry_after))
                     logger.warning(
-                        f"Batch {batch_num} failed (attempt {attempt + 1}): {e}. "
-                        f"Retrying in {delay:.1f}s..."
+                        "Batch %d failed (attempt %d): %s. Retrying in %.1fs...",
+                        batch_num,
+                        attempt + 1,
+                        e,
+                        delay,
                     )
                     time.sleep(delay)
                 else:
                     logger.error(
-                        f"Batch {batch_num} failed after {max_retries + 1} attempts: {e}"
+                        "Batch %d failed after %d attempts: %s",
+                        batch_num,
+                        max_retries + 1,
+                        e,
                     )
                     raise
+        return []  # unreachable; the final attempt either returns or raises
+
+    batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+    results: list[R] = []
+
+    if len(batches) <= 1 or concurrency <= 1:
+        # No point spinning up a pool for a single batch
+        for batch_num, batch in enumerate(batches, start=1):
+            results.extend(_run_batch(batch, batch_num))
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(batches))) as executor:
+        futures = [
+            executor.submit(_run_batch, batch, batch_num)
+            for batch_num, batch in enumerate(batches, start=1)
+        ]
+        # Iterate in submission order so output order matches input order
+        for future in futures:
+            results.extend(future.result())
 
     return results
@@ -1,30 +1,47 @@
+from typing import Optional
+
+
 class EmailManagerError(Exception):
-    pass
+    # Empty __slots__ throughout the hierarchy: these carry only their
+    # message, so skip the per-instance __dict__
+    __slots__ = ()
 
 
 class GmailAuthError(EmailManagerError):
-    pass
+    __slots__ = ()
 
 
 class GmailFetchError(EmailManagerError):
-    pass
+    __slots__ = ()
 
 
 class AnthropicAPIError(EmailManagerError):
-    pass
+    __slots__ = ()
 
 
 class AnthropicRateLimitError(AnthropicAPIError):
-    pass
+    # Structured throttle metadata so retry loops can honor the server's
+    # Retry-After hint instead of reparsing the message
+    __slots__ = ("retry_after", "request_id")
+
+    def __init__(
+        self,
+        message: str,
+        retry_after: Optional[float] = None,
+        request_id: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.request_id = request_id
 
 
 class SlackDeliveryError(EmailManagerError):
-    pass
+    __slots__ = ()
 
 
 class ConfigError(EmailManagerError):
-    pass
+    __slots__ = ()
 
 
 class TokenRefreshError(GmailAuthError):
-    pass
+    __slots__ = ()
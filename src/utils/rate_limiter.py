@@ -5,27 +5,126 @@ import time
 from collections import deque
 
 
+# Shared-limiter registry: components throttling the same upstream API must
+# share one bucket, or each instance would spend the full quota on its own.
+# Module scope also carries the bucket state across warm Lambda invocations.
+_REGISTRY: dict[tuple[str, int, float], "TokenBucketRateLimiter"] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_limiter(name: str, max_requests: int, per_seconds: float) -> "TokenBucketRateLimiter":
+    """Return the process-wide limiter for an API, creating it on first use."""
+    key = (name, max_requests, per_seconds)
+    with _REGISTRY_LOCK:
+        limiter = _REGISTRY.get(key)
+        if limiter is None:
+            limiter = TokenBucketRateLimiter(max_requests, per_seconds)
+            _REGISTRY[key] = limiter
+        return limiter
+
+
 class TokenBucketRateLimiter:
-    """Thread-safe token-bucket rate limiter for API calls."""
+    """Thread-safe token-bucket rate limiter for API calls.
+
+    A float token counter refilled at max_requests/per_seconds: two
+    arithmetic ops per acquire instead of sweeping a timestamp deque, and
+    no per-call memory growth.
+    """
 
     def __init__(self, max_requests: int, per_seconds: float):
         self._max_requests = max_requests
-        self._per_seconds = per_seconds
-        self._timestamps: deque[float] = deque()
+        self._refill_rate = max_requests / per_seconds
+        self._tokens = float(max_requests)
+        self._last_refill = time.monotonic()
         self._lock = threading.Lock()
 
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            float(self._max_requests),
+            self._tokens + (now - self._last_refill) * self._refill_rate,
+        )
+        self._last_refill = now
+
     def acquire(self) -> None:
         """Block until a request slot is available."""
         while True:
             with self._lock:
                 now = time.monotonic()
-                while self._timestamps and self._timestamps[0] <= now - self._per_seconds:
-                    self._timestamps.popleft()
+                self._refill(now)
 
-                if len(self._timestamps) < self._max_requests:
-                    self._timestamps.append(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
                     return
 
-                wait_time = self._timestamps[0] + self._per_seconds - now
+                wait_time = (1.0 - self._tokens) / self._refill_rate
 
+            # Sleep outside the lock so other threads can refill/spend
             time.sleep(wait_time)
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is available right now, without blocking."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class SlidingWindowRateLimiter:
+    """Thread-safe sliding-window limiter over request and token budgets.
+
+    Tracks both how many requests and how many (estimated) tokens were spent
+    in the trailing window, blocking before dispatch rather than reacting to
+    429s. Estimates can be corrected once actual usage is known.
+    """
+
+    def __init__(self, max_requests: int, max_tokens: int, per_seconds: float = 60.0):
+        self._max_requests = max_requests
+        self._max_tokens = max_tokens
+        self._per_seconds = per_seconds
+        # (timestamp, tokens, request_count) — corrections carry count 0
+        self._entries: deque[tuple[float, int, int]] = deque()
+        self._token_total = 0
+        self._request_total = 0
+        # Condition instead of a bare lock: adjust() can free budget early,
+        # and notifying waiters beats having them poll on a fixed sleep
+        self._cv = threading.Condition()
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until both the request and token windows have capacity."""
+        with self._cv:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+
+                # An oversized single request is admitted into an empty window
+                # rather than deadlocking on an unreachable budget
+                if self._request_total < self._max_requests and (
+                    self._token_total + tokens <= self._max_tokens or not self._entries
+                ):
+                    self._entries.append((now, tokens, 1))
+                    self._token_total += tokens
+                    self._request_total += 1
+                    return
+
+                # Wake either when the oldest entry expires or when adjust()
+                # hands back budget, whichever comes first
+                wait_time = self._entries[0][0] + self._per_seconds - now
+                self._cv.wait(timeout=max(wait_time, 0.05))
+
+    def adjust(self, delta: int) -> None:
+        """Correct an earlier estimate once the real token count is known."""
+        with self._cv:
+            self._entries.append((time.monotonic(), delta, 0))
+            self._token_total += delta
+            if delta < 0:
+                # Budget was returned — wake waiters so they can re-check
+                self._cv.notify_all()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self._per_seconds
+        while self._entries and self._entries[0][0] <= cutoff:
+            _, tokens, requests = self._entries.popleft()
+            self._token_total -= tokens
+            self._request_total -= requests